@@ -1,54 +1,149 @@
+import re
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import CustomUser, SkinListing, Order, Deposit
+from django.db.models import Q
+from django.utils.text import smart_split, unescape_string_literal
+from .models import CustomUser, UserProfile, SkinListing, Order, Deposit
+from .pagination import PkSubqueryPaginator
+
+
+class AdvancedAdminSearchMixin:
+    """
+    Admin search mixin that matches identifier-like terms exactly.
+
+    Search terms that look like a hash or a numeric ID are looked up with
+    ``exact`` against ``exact_search_fields`` so the column index is used
+    instead of a ``LIKE '%term%'`` scan. Other terms go through the regular
+    ``search_fields`` handling.
+    """
+    exact_search_fields = ()
+    identifier_re = re.compile(r'^(?:[0-9a-fA-F]{16,}|\d+)$')
+
+    def get_search_results(self, request, queryset, search_term):
+        if not self.exact_search_fields:
+            return super().get_search_results(request, queryset, search_term)
+
+        identifier_terms = []
+        text_terms = []
+        for bit in smart_split(search_term):
+            term = bit
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                term = unescape_string_literal(bit)
+            if self.identifier_re.match(term):
+                identifier_terms.append(term)
+            else:
+                text_terms.append(bit)
+
+        queryset, may_have_duplicates = super().get_search_results(
+            request, queryset, ' '.join(text_terms)
+        )
+        for term in identifier_terms:
+            exact_query = Q()
+            for field_name in self.exact_search_fields:
+                exact_query |= Q(**{f"{field_name}__exact": term})
+            queryset = queryset.filter(exact_query)
+        return queryset, may_have_duplicates
+
+
+class OnlyColumnsChangeList(ChangeList):
+    """ChangeList that loads only the model admin's ``list_only`` columns."""
+
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        return queryset.only(*self.model_admin.list_only)
+
+
+class ListOnlyMixin:
+    """
+    Admin mixin that narrows changelist rows to the rendered columns.
+
+    ``list_only`` should name every field used by ``list_display``,
+    including the related fields rendered through ``__str__``. Change views
+    are unaffected and still load full rows.
+    """
+    list_only = ()
+
+    def get_changelist(self, request, **kwargs):
+        if self.list_only:
+            return OnlyColumnsChangeList
+        return super().get_changelist(request, **kwargs)
+
+
+class UserProfileInline(admin.StackedInline):
+    """Inline editor for the user's Steam and wallet settings."""
+    model = UserProfile
+    can_delete = False
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(BaseUserAdmin):
+class CustomUserAdmin(AdvancedAdminSearchMixin, BaseUserAdmin):
     """Admin interface for CustomUser model."""
     list_display = ['username', 'steam_id', 'email', 'balance_active', 'balance_frozen', 'is_staff']
     list_filter = ['is_staff', 'is_superuser', 'is_active']
+    exact_search_fields = ['steam_id']
+    inlines = [UserProfileInline]
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Steam Information', {
-            'fields': ('steam_id', 'steam_api_key', 'trade_url')
+            'fields': ('steam_id',)
         }),
         ('Wallet Information', {
-            'fields': ('wallet_address', 'balance_active', 'balance_frozen')
+            'fields': ('balance_active', 'balance_frozen')
         }),
     )
     add_fieldsets = BaseUserAdmin.add_fieldsets + (
         ('Steam Information', {
-            'fields': ('steam_id', 'steam_api_key', 'trade_url')
-        }),
-        ('Wallet Information', {
-            'fields': ('wallet_address',)
+            'fields': ('steam_id',)
         }),
     )
 
 
 @admin.register(SkinListing)
-class SkinListingAdmin(admin.ModelAdmin):
+class SkinListingAdmin(ListOnlyMixin, AdvancedAdminSearchMixin, admin.ModelAdmin):
     """Admin interface for SkinListing model."""
-    list_display = ['market_name', 'seller', 'price_ton', 'status', 'created_at']
+    list_display = ['market_name', 'seller_username', 'price_ton', 'status', 'created_at']
+    list_only = ['id', 'market_name', 'seller_username', 'price_ton', 'status', 'created_at']
     list_filter = ['status', 'created_at']
-    search_fields = ['market_name', 'asset_id', 'seller__username']
+    # market_name is served by the listing_name_trgm GIN index on PostgreSQL
+    search_fields = ['market_name__icontains', 'asset_id__startswith', '^seller_username']
+    exact_search_fields = ['asset_id']
     readonly_fields = ['created_at', 'updated_at']
+    paginator = PkSubqueryPaginator
+    show_full_result_count = False
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(ListOnlyMixin, AdvancedAdminSearchMixin, admin.ModelAdmin):
     """Admin interface for Order model."""
     list_display = ['id', 'buyer', 'seller', 'listing', 'amount', 'status', 'created_at']
+    list_select_related = ['buyer', 'seller', 'listing']
+    list_only = [
+        'id', 'amount', 'status', 'created_at',
+        'buyer__username', 'buyer__steam_id',
+        'seller__username', 'seller__steam_id',
+        'listing__market_name', 'listing__status', 'listing__seller_username',
+    ]
     list_filter = ['status', 'created_at']
-    search_fields = ['buyer__username', 'seller__username', 'steam_trade_id']
+    search_fields = ['^buyer__username', '^seller__username', 'steam_trade_id__startswith']
+    exact_search_fields = ['steam_trade_id']
     readonly_fields = ['created_at', 'updated_at']
+    paginator = PkSubqueryPaginator
+    show_full_result_count = False
 
 
 @admin.register(Deposit)
-class DepositAdmin(admin.ModelAdmin):
+class DepositAdmin(ListOnlyMixin, AdvancedAdminSearchMixin, admin.ModelAdmin):
     """Admin interface for Deposit model."""
     list_display = ['id', 'user', 'amount', 'tx_hash', 'status', 'comment_code', 'created_at', 'confirmed_at']
+    list_select_related = ['user']
+    list_only = [
+        'id', 'amount', 'tx_hash', 'status', 'comment_code', 'created_at', 'confirmed_at',
+        'user__username', 'user__steam_id',
+    ]
     list_filter = ['status', 'created_at']
-    search_fields = ['user__username', 'tx_hash', 'comment_code']
+    search_fields = ['^user__username', 'tx_hash__startswith', 'comment_code__startswith']
+    exact_search_fields = ['tx_hash', 'comment_code']
     readonly_fields = ['created_at', 'updated_at', 'confirmed_at']
+    paginator = PkSubqueryPaginator
+    show_full_result_count = False
     date_hierarchy = 'created_at'
@@ -0,0 +1,96 @@
+"""
+Custom model fields for the marketplace.
+"""
+from decimal import Decimal, InvalidOperation
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import models
+
+# TON has a fixed 9-decimal minor unit (1 TON = 10**9 nanoTON)
+NANOTON_PER_TON = 10 ** 9
+TON_DECIMAL_PLACES = 9
+
+
+def to_nano(amount) -> int:
+    """
+    Convert a TON amount to integer nanoTON.
+
+    Args:
+        amount: TON amount as Decimal, int, str or float
+
+    Returns:
+        Amount in nanoTON
+
+    Raises:
+        ValueError: If the amount has digits below 1 nanoTON
+    """
+    if isinstance(amount, float):
+        amount = str(amount)
+    nano = Decimal(amount) * NANOTON_PER_TON
+    if nano != nano.to_integral_value():
+        raise ValueError(f"TON amounts can have at most {TON_DECIMAL_PLACES} decimal places.")
+    return int(nano)
+
+
+def from_nano(nano: int) -> Decimal:
+    """
+    Convert integer nanoTON to a TON Decimal.
+
+    Trailing zeros are dropped (0 nanoTON is ``Decimal('0')``, not
+    ``Decimal('0E-9')``), so values format cleanly in messages.
+    """
+    return Decimal(nano) / NANOTON_PER_TON
+
+
+class NanoTonField(models.BigIntegerField):
+    """
+    TON amount stored as a BIGINT count of nanoTON.
+
+    Python code keeps working with Decimal TON values; conversion happens
+    only at the database boundary. Expressions such as F() arithmetic operate
+    on the raw column, so operands must be converted with ``to_nano`` first.
+    """
+    description = "TON amount stored as integer nanoTON"
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return from_nano(value)
+
+    def to_python(self, value):
+        if value is None:
+            return value
+        if not isinstance(value, Decimal):
+            if isinstance(value, float):
+                value = str(value)
+            try:
+                value = Decimal(value)
+            except (InvalidOperation, TypeError, ValueError):
+                raise ValidationError(
+                    "'%(value)s' value must be a decimal number.",
+                    code='invalid',
+                    params={'value': value},
+                )
+        # Sub-nanoTON digits can't be stored; reject them instead of truncating
+        try:
+            to_nano(value)
+        except ValueError:
+            raise ValidationError(
+                "Ensure that there are no more than %(max)s decimal places.",
+                code='max_decimal_places',
+                params={'max': TON_DECIMAL_PLACES},
+            )
+        return value
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None:
+            return None
+        return to_nano(self.to_python(value))
+
+    def formfield(self, **kwargs):
+        return models.Field.formfield(self, **{
+            'form_class': forms.DecimalField,
+            'decimal_places': TON_DECIMAL_PLACES,
+            **kwargs,
+        })
@@ -0,0 +1,55 @@
+"""
+Middleware for the marketplace.
+"""
+import re
+from django.urls import ResolverMatch
+from . import views
+
+# Highest-traffic read-only routes, dispatched without going through the
+# URLResolver. Must mirror the matching entries in core/urls.py.
+FAST_EXACT_ROUTES = {
+    '/': (views.home, 'home', ''),
+    '/browse/': (views.browse_listings, 'browse_listings', 'browse/'),
+    '/orders/': (views.my_orders, 'my_orders', 'orders/'),
+}
+FAST_LISTING_RE = re.compile(r'^/listing/(\d+)/$')
+
+
+class FastPathMiddleware:
+    """
+    Dispatch a handful of hot GET routes straight to their views.
+
+    Matching requests skip URL resolution and any later middleware's
+    ``process_view`` hooks, so only GET/HEAD requests are short-circuited
+    (CSRF checks never apply to them) and this middleware must come after
+    the session, auth and messages middleware. Everything else falls
+    through to normal resolution.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return self.get_response(request)
+
+        path = request.path_info
+        route = FAST_EXACT_ROUTES.get(path)
+        if route is not None:
+            view, url_name, pattern = route
+            kwargs = {}
+        else:
+            match = FAST_LISTING_RE.match(path)
+            if match is None:
+                return self.get_response(request)
+            view, url_name, pattern = views.listing_detail, 'listing_detail', 'listing/<int:listing_id>/'
+            kwargs = {'listing_id': int(match.group(1))}
+
+        request.resolver_match = ResolverMatch(
+            view, (), kwargs,
+            url_name=url_name,
+            app_names=['core'],
+            namespaces=['core'],
+            route=pattern,
+        )
+        return view(request, **kwargs)
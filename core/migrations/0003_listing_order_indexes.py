@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-15 06:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_customuser_steam_api_key_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['buyer', '-created_at'], name='core_order_buyer_i_bca58a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['seller', '-created_at'], name='core_order_seller__c9b9e9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skinlisting',
+            index=models.Index(fields=['-created_at'], name='core_skinli_created_496bb9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skinlisting',
+            index=models.Index(fields=['status', '-created_at'], name='core_skinli_status_e4f948_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skinlisting',
+            index=models.Index(fields=['seller', 'status'], name='core_skinli_seller__84b317_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skinlisting',
+            index=models.Index(condition=models.Q(('status', 'ACTIVE')), fields=['-created_at'], name='skinlisting_active_idx'),
+        ),
+    ]
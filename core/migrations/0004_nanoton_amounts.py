@@ -0,0 +1,131 @@
+# Generated by Django 6.0 on 2026-10-15 07:05
+
+import core.fields
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+# (model_name, field_name) pairs converted from DecimalField(20, 8) to nanoTON
+AMOUNT_FIELDS = [
+    ('customuser', 'balance_active'),
+    ('customuser', 'balance_frozen'),
+    ('skinlisting', 'price_ton'),
+    ('order', 'amount'),
+    ('deposit', 'amount'),
+]
+
+
+def copy_amounts(apps, source_suffix, target_suffix):
+    """Copy every amount field into its counterpart, model by model."""
+    fields_by_model = {}
+    for model_name, field_name in AMOUNT_FIELDS:
+        fields_by_model.setdefault(model_name, []).append(field_name)
+
+    for model_name, field_names in fields_by_model.items():
+        model = apps.get_model('core', model_name)
+        sources = [f"{name}{source_suffix}" for name in field_names]
+        targets = [f"{name}{target_suffix}" for name in field_names]
+        batch = []
+        for obj in model.objects.only('pk', *sources).iterator(chunk_size=2000):
+            for source, target in zip(sources, targets):
+                # Both fields hold TON Decimals in Python; NanoTonField
+                # converts to and from nanoTON at the database boundary
+                setattr(obj, target, getattr(obj, source))
+            batch.append(obj)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, targets)
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, targets)
+
+
+def copy_to_nano(apps, schema_editor):
+    """Copy every Decimal amount into its BIGINT nanoTON counterpart."""
+    copy_amounts(apps, '', '_nano')
+
+
+def copy_from_nano(apps, schema_editor):
+    """Copy every nanoTON amount back into its Decimal counterpart."""
+    copy_amounts(apps, '_nano', '')
+
+
+def decimal_field(help_text, **kwargs):
+    return models.DecimalField(
+        decimal_places=8,
+        max_digits=20,
+        help_text=help_text,
+        validators=[django.core.validators.MinValueValidator(Decimal('0.00'))],
+        **kwargs
+    )
+
+
+def nano_field(help_text, **kwargs):
+    return core.fields.NanoTonField(
+        help_text=help_text,
+        validators=[django.core.validators.MinValueValidator(Decimal('0.00'))],
+        **kwargs
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_listing_order_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='balance_active_nano',
+            field=nano_field('Active balance available for use', default=Decimal('0.00')),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='balance_frozen_nano',
+            field=nano_field('Frozen balance (held in escrow)', default=Decimal('0.00')),
+        ),
+        migrations.AddField(
+            model_name='skinlisting',
+            name='price_ton_nano',
+            field=nano_field('Price in TON', default=Decimal('0.00')),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='amount_nano',
+            field=nano_field('Order amount in TON', default=Decimal('0.00')),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='deposit',
+            name='amount_nano',
+            field=nano_field('Deposit amount in TON', default=Decimal('0.00')),
+            preserve_default=False,
+        ),
+        # Amounts without a default can only be re-added as nullable columns
+        # when this migration is rolled back; copy_from_nano() fills them
+        # before NOT NULL is restored
+        migrations.AlterField(
+            model_name='skinlisting',
+            name='price_ton',
+            field=decimal_field('Price in TON', null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='amount',
+            field=decimal_field('Order amount in TON', null=True),
+        ),
+        migrations.AlterField(
+            model_name='deposit',
+            name='amount',
+            field=decimal_field('Deposit amount in TON', null=True),
+        ),
+        migrations.RunPython(copy_to_nano, copy_from_nano),
+    ] + [
+        migrations.RemoveField(model_name=model_name, name=field_name)
+        for model_name, field_name in AMOUNT_FIELDS
+    ] + [
+        migrations.RenameField(model_name=model_name, old_name=f"{field_name}_nano", new_name=field_name)
+        for model_name, field_name in AMOUNT_FIELDS
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_nanoton_amounts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skinlisting',
+            index=models.Index(fields=['asset_id'], name='listing_asset_id_like_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
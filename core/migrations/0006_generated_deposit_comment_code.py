@@ -0,0 +1,41 @@
+# Generated by Django 6.0 on 2026-10-15 06:52
+
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models.functions import Cast, Concat
+
+
+def fill_comment_code(apps, schema_editor):
+    Deposit = apps.get_model('core', 'Deposit')
+    Deposit.objects.update(
+        comment_code=Concat(models.Value('user_'), Cast('user_id', models.CharField(max_length=20)))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_admin_search_pattern_indexes'),
+    ]
+
+    # Columns can't be altered into generated ones, so drop and re-add it.
+    # On rollback the plain column comes back nullable and is filled by
+    # fill_comment_code() before NOT NULL is restored
+    operations = [
+        migrations.AlterField(
+            model_name='deposit',
+            name='comment_code',
+            field=models.CharField(help_text='Unique comment code used for deposit identification', max_length=255, null=True),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, fill_comment_code),
+        migrations.RemoveField(
+            model_name='deposit',
+            name='comment_code',
+        ),
+        migrations.AddField(
+            model_name='deposit',
+            name='comment_code',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=django.db.models.functions.text.Concat(models.Value('user_'), django.db.models.functions.comparison.Cast('user_id', models.CharField(max_length=20))), help_text='Unique comment code used for deposit identification', output_field=models.CharField(max_length=255)),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-15 06:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0006_generated_deposit_comment_code'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='customuser',
+            constraint=models.CheckConstraint(condition=models.Q(('balance_active__gte', 0)), name='balance_active_nonneg'),
+        ),
+        migrations.AddConstraint(
+            model_name='customuser',
+            constraint=models.CheckConstraint(condition=models.Q(('balance_frozen__gte', 0)), name='balance_frozen_nonneg'),
+        ),
+        migrations.AddConstraint(
+            model_name='deposit',
+            constraint=models.CheckConstraint(condition=models.Q(('amount__gte', 0)), name='deposit_amount_nonneg'),
+        ),
+        migrations.AddConstraint(
+            model_name='order',
+            constraint=models.CheckConstraint(condition=models.Q(('amount__gte', 0)), name='order_amount_nonneg'),
+        ),
+        migrations.AddConstraint(
+            model_name='skinlisting',
+            constraint=models.CheckConstraint(condition=models.Q(('price_ton__gte', 0)), name='listing_price_ton_nonneg'),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 6.0 on 2026-10-15 06:56
+
+from django.db import migrations, models
+
+
+POSTGRESQL_TRIGGER_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION core_sync_seller_username() RETURNS trigger AS $$
+    BEGIN
+        UPDATE core_skinlisting SET seller_username = NEW.username WHERE seller_id = NEW.id;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER core_customuser_sync_seller_username
+    AFTER UPDATE OF username ON core_customuser
+    FOR EACH ROW WHEN (OLD.username IS DISTINCT FROM NEW.username)
+    EXECUTE FUNCTION core_sync_seller_username();
+    """,
+]
+
+SQLITE_TRIGGER_SQL = [
+    """
+    CREATE TRIGGER core_customuser_sync_seller_username
+    AFTER UPDATE OF username ON core_customuser
+    FOR EACH ROW WHEN OLD.username IS NOT NEW.username
+    BEGIN
+        UPDATE core_skinlisting SET seller_username = NEW.username WHERE seller_id = NEW.id;
+    END;
+    """,
+]
+
+DROP_TRIGGER_SQL = {
+    'postgresql': [
+        "DROP TRIGGER IF EXISTS core_customuser_sync_seller_username ON core_customuser;",
+        "DROP FUNCTION IF EXISTS core_sync_seller_username();",
+    ],
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS core_customuser_sync_seller_username;",
+    ],
+}
+
+
+def populate_seller_username(apps, schema_editor):
+    SkinListing = apps.get_model('core', 'SkinListing')
+    CustomUser = apps.get_model('core', 'CustomUser')
+    SkinListing.objects.update(
+        seller_username=models.Subquery(
+            CustomUser.objects.filter(pk=models.OuterRef('seller_id')).values('username')[:1]
+        )
+    )
+
+
+def create_trigger(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRESQL_TRIGGER_SQL, 'sqlite': SQLITE_TRIGGER_SQL}.get(vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_trigger(apps, schema_editor):
+    for sql in DROP_TRIGGER_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_amount_check_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skinlisting',
+            name='seller_username',
+            field=models.CharField(db_index=True, default='', editable=False, help_text='Denormalized seller username, kept in sync by a database trigger', max_length=150),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_seller_username, migrations.RunPython.noop),
+        # Keep seller_username in sync when a user is renamed
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 6.0 on 2026-10-15 06:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+PROFILE_FIELDS = ['steam_api_key', 'trade_url', 'wallet_address']
+
+
+def copy_profiles(apps, schema_editor):
+    CustomUser = apps.get_model('core', 'CustomUser')
+    UserProfile = apps.get_model('core', 'UserProfile')
+    batch = []
+    for user in CustomUser.objects.only('pk', *PROFILE_FIELDS).iterator(chunk_size=2000):
+        batch.append(UserProfile(user_id=user.pk, **{name: getattr(user, name) for name in PROFILE_FIELDS}))
+        if len(batch) >= 2000:
+            UserProfile.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        UserProfile.objects.bulk_create(batch)
+
+
+def restore_profiles(apps, schema_editor):
+    CustomUser = apps.get_model('core', 'CustomUser')
+    UserProfile = apps.get_model('core', 'UserProfile')
+    for profile in UserProfile.objects.iterator(chunk_size=2000):
+        CustomUser.objects.filter(pk=profile.user_id).update(
+            **{name: getattr(profile, name) for name in PROFILE_FIELDS}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_skinlisting_seller_username'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserProfile',
+            fields=[
+                ('user', models.OneToOneField(help_text='User these settings belong to', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('steam_api_key', models.CharField(blank=True, help_text='Steam API key (should be encrypted in production)', max_length=255)),
+                ('trade_url', models.CharField(blank=True, help_text='Steam trade URL', max_length=500)),
+                ('wallet_address', models.CharField(blank=True, help_text='TON wallet address for withdrawals', max_length=255)),
+            ],
+            options={
+                'verbose_name': 'User Profile',
+                'verbose_name_plural': 'User Profiles',
+            },
+        ),
+        migrations.RunPython(copy_profiles, restore_profiles),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='steam_api_key',
+        ),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='trade_url',
+        ),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='wallet_address',
+        ),
+    ]
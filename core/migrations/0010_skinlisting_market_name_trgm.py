@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-15 07:10
+
+from django.db import migrations
+
+
+CREATE_INDEX_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+-- Django compiles icontains to UPPER(market_name::text) LIKE UPPER(%s),
+-- so the index is built on that expression
+CREATE INDEX IF NOT EXISTS listing_name_trgm
+    ON core_skinlisting USING gin ((UPPER(market_name::text)) gin_trgm_ops);
+"""
+
+DROP_INDEX_SQL = "DROP INDEX IF EXISTS listing_name_trgm;"
+
+
+def create_index(apps, schema_editor):
+    # Trigram indexes are PostgreSQL-only; SQLite keeps scanning market_name
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_INDEX_SQL, params=None)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEX_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_userprofile'),
+    ]
+
+    operations = [
+        # GIN trigram index so market_name ILIKE '%q%' searches avoid a seq scan
+        migrations.RunPython(create_index, drop_index),
+    ]
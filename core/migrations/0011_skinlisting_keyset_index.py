@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-15 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_skinlisting_market_name_trgm'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='skinlisting',
+            name='core_skinli_status_e4f948_idx',
+        ),
+        migrations.AddIndex(
+            model_name='skinlisting',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='core_skinli_status_6ed5fb_idx'),
+        ),
+    ]
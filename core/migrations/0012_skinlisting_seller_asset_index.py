@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-15 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_skinlisting_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='skinlisting',
+            name='core_skinli_seller__84b317_idx',
+        ),
+        migrations.AddIndex(
+            model_name='skinlisting',
+            index=models.Index(fields=['seller', 'status', 'asset_id'], name='core_skinli_seller__bebd9c_idx'),
+        ),
+    ]
@@ -1,7 +1,31 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import connections, models
+from django.db.models.functions import Cast, Concat
 from django.core.validators import MinValueValidator
 from decimal import Decimal
+from django.utils import timezone
+from .fields import NanoTonField, to_nano
+
+
+class ListingStatus(models.TextChoices):
+    ACTIVE = 'ACTIVE', 'Active'
+    SOLD = 'SOLD', 'Sold'
+    CANCELLED = 'CANCELLED', 'Cancelled'
+
+
+class OrderStatus(models.TextChoices):
+    PAID = 'PAID', 'Paid'
+    SENT = 'SENT', 'Sent'
+    COMPLETED = 'COMPLETED', 'Completed'
+    RELEASED = 'RELEASED', 'Released'
+    DISPUTED = 'DISPUTED', 'Disputed'
+
+
+class DepositStatus(models.TextChoices):
+    PENDING = 'PENDING', 'Pending'
+    CONFIRMED = 'CONFIRMED', 'Confirmed'
+    FAILED = 'FAILED', 'Failed'
+    CANCELLED = 'CANCELLED', 'Cancelled'
 
 
 class CustomUser(AbstractUser):
@@ -9,19 +33,12 @@ class CustomUser(AbstractUser):
     Custom user model extending AbstractUser for P2P CS2 Skin Marketplace.
     """
     steam_id = models.CharField(max_length=255, unique=True, blank=True, null=True, help_text="Steam ID of the user", db_index=True)
-    steam_api_key = models.CharField(max_length=255, blank=True, help_text="Steam API key (should be encrypted in production)")
-    trade_url = models.CharField(max_length=500, blank=True, help_text="Steam trade URL")
-    wallet_address = models.CharField(max_length=255, blank=True, help_text="TON wallet address for withdrawals")
-    balance_active = models.DecimalField(
-        max_digits=20,
-        decimal_places=8,
+    balance_active = NanoTonField(
         default=Decimal('0.00'),
         validators=[MinValueValidator(Decimal('0.00'))],
         help_text="Active balance available for use"
     )
-    balance_frozen = models.DecimalField(
-        max_digits=20,
-        decimal_places=8,
+    balance_frozen = NanoTonField(
         default=Decimal('0.00'),
         validators=[MinValueValidator(Decimal('0.00'))],
         help_text="Frozen balance (held in escrow)"
@@ -30,27 +47,54 @@ class CustomUser(AbstractUser):
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        constraints = [
+            models.CheckConstraint(condition=models.Q(balance_active__gte=0), name='balance_active_nonneg'),
+            models.CheckConstraint(condition=models.Q(balance_frozen__gte=0), name='balance_frozen_nonneg'),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.steam_id})"
 
 
+class UserProfile(models.Model):
+    """
+    Rarely-accessed user settings, kept off CustomUser to keep its rows narrow.
+    """
+    user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='profile',
+        help_text="User these settings belong to"
+    )
+    steam_api_key = models.CharField(max_length=255, blank=True, help_text="Steam API key (should be encrypted in production)")
+    trade_url = models.CharField(max_length=500, blank=True, help_text="Steam trade URL")
+    wallet_address = models.CharField(max_length=255, blank=True, help_text="TON wallet address for withdrawals")
+
+    class Meta:
+        verbose_name = "User Profile"
+        verbose_name_plural = "User Profiles"
+
+    def __str__(self):
+        return f"Profile of user #{self.user_id}"
+
+
 class SkinListing(models.Model):
     """
     Model representing a CS2 skin listing on the marketplace.
     """
-    STATUS_CHOICES = [
-        ('ACTIVE', 'Active'),
-        ('SOLD', 'Sold'),
-        ('CANCELLED', 'Cancelled'),
-    ]
-
     seller = models.ForeignKey(
         CustomUser,
         on_delete=models.CASCADE,
         related_name='listings',
         help_text="User who listed the skin"
     )
+    seller_username = models.CharField(
+        max_length=150,
+        db_index=True,
+        editable=False,
+        help_text="Denormalized seller username, kept in sync by a database trigger"
+    )
     asset_id = models.CharField(
         max_length=255,
         help_text="Steam Item Asset ID"
@@ -59,16 +103,14 @@ class SkinListing(models.Model):
         max_length=255,
         help_text="Market name of the skin item"
     )
-    price_ton = models.DecimalField(
-        max_digits=20,
-        decimal_places=8,
+    price_ton = NanoTonField(
         validators=[MinValueValidator(Decimal('0.00'))],
         help_text="Price in TON"
     )
     status = models.CharField(
         max_length=20,
-        choices=STATUS_CHOICES,
-        default='ACTIVE',
+        choices=ListingStatus.choices,
+        default=ListingStatus.ACTIVE,
         help_text="Current status of the listing"
     )
     created_at = models.DateTimeField(auto_now_add=True)
@@ -78,23 +120,46 @@ class SkinListing(models.Model):
         verbose_name = "Skin Listing"
         verbose_name_plural = "Skin Listings"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+            # Keyset pagination on the browse page seeks on (created_at, id)
+            models.Index(fields=['status', '-created_at', '-id']),
+            # Covers the seller's listed-asset lookups in sell_item
+            models.Index(fields=['seller', 'status', 'asset_id']),
+            # Serves prefix (LIKE 'q%') admin searches on PostgreSQL
+            models.Index(fields=['asset_id'], name='listing_asset_id_like_idx', opclasses=['varchar_pattern_ops']),
+            # Partial index covering the browse page's hot set
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(status=ListingStatus.ACTIVE),
+                name='skinlisting_active_idx',
+            ),
+            # market_name substring search uses the PostgreSQL-only
+            # listing_name_trgm GIN index created in migration 0010
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(price_ton__gte=0), name='listing_price_ton_nonneg'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Username changes are propagated by the core_customuser trigger;
+        # here we only need to capture the seller when it is being saved
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.seller_username = self.seller.username
+        elif {'seller', 'seller_id'} & set(update_fields):
+            self.seller_username = self.seller.username
+            kwargs['update_fields'] = {*update_fields, 'seller_username'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.market_name} - {self.seller.username} ({self.status})"
+        return f"{self.market_name} - {self.seller_username} ({self.status})"
 
 
 class Order(models.Model):
     """
     Model representing an order/transaction in the marketplace.
     """
-    STATUS_CHOICES = [
-        ('PAID', 'Paid'),
-        ('SENT', 'Sent'),
-        ('COMPLETED', 'Completed'),
-        ('RELEASED', 'Released'),
-        ('DISPUTED', 'Disputed'),
-    ]
-
     buyer = models.ForeignKey(
         CustomUser,
         on_delete=models.CASCADE,
@@ -113,16 +178,14 @@ class Order(models.Model):
         related_name='orders',
         help_text="The skin listing this order is for"
     )
-    amount = models.DecimalField(
-        max_digits=20,
-        decimal_places=8,
+    amount = NanoTonField(
         validators=[MinValueValidator(Decimal('0.00'))],
         help_text="Order amount in TON"
     )
     status = models.CharField(
         max_length=20,
-        choices=STATUS_CHOICES,
-        default='PAID',
+        choices=OrderStatus.choices,
+        default=OrderStatus.PAID,
         help_text="Current status of the order"
     )
     steam_trade_id = models.CharField(
@@ -143,31 +206,84 @@ class Order(models.Model):
         verbose_name = "Order"
         verbose_name_plural = "Orders"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['buyer', '-created_at']),
+            models.Index(fields=['seller', '-created_at']),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(amount__gte=0), name='order_amount_nonneg'),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} - {self.buyer.username} -> {self.seller.username} ({self.status})"
 
 
+class DepositManager(models.Manager):
+    """
+    Manager for Deposit with single-statement deposit inserts.
+    """
+    _INSERT_FIELDS = ('user', 'amount', 'tx_hash', 'status', 'created_at', 'updated_at', 'confirmed_at')
+
+    def insert_confirmed(self, user_id, amount, tx_hash):
+        """
+        Insert a confirmed deposit unless its tx_hash was already processed.
+
+        Uses ``INSERT ... ON CONFLICT (tx_hash) DO NOTHING RETURNING``, so a
+        duplicate costs one statement and never raises.
+
+        Returns:
+            The created Deposit, or None if tx_hash was already processed
+        """
+        deposits = self.insert_confirmed_many([(user_id, amount, tx_hash)])
+        return deposits[0] if deposits else None
+
+    def insert_confirmed_many(self, rows):
+        """
+        Insert confirmed deposits, skipping tx_hashes that were already processed.
+
+        Rows go in as multi-row ``INSERT ... ON CONFLICT (tx_hash) DO NOTHING
+        RETURNING`` statements (one per backend batch), so a hash inserted
+        concurrently by another process is skipped instead of failing the
+        whole batch.
+
+        Args:
+            rows: List of ``(user_id, amount, tx_hash)`` tuples
+
+        Returns:
+            The Deposits that were actually inserted
+        """
+        ops = connections[self.db].ops
+        now = ops.adapt_datetimefield_value(timezone.now())
+        fields = [self.model._meta.get_field(name) for name in self._INSERT_FIELDS]
+        columns = ', '.join(field.column for field in fields)
+        placeholder = '(%s)' % ', '.join(['%s'] * len(fields))
+        batch_size = max(ops.bulk_batch_size(fields, rows), 1)
+        deposits = []
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            params = []
+            for user_id, amount, tx_hash in batch:
+                params += [user_id, to_nano(amount), tx_hash, DepositStatus.CONFIRMED, now, now, now]
+            deposits += self.raw(
+                'INSERT INTO core_deposit (%s) VALUES %s ON CONFLICT (tx_hash) DO NOTHING RETURNING *' % (
+                    columns, ', '.join([placeholder] * len(batch))
+                ),
+                params,
+            )
+        return deposits
+
+
 class Deposit(models.Model):
     """
     Model representing a TON deposit transaction.
     """
-    STATUS_CHOICES = [
-        ('PENDING', 'Pending'),
-        ('CONFIRMED', 'Confirmed'),
-        ('FAILED', 'Failed'),
-        ('CANCELLED', 'Cancelled'),
-    ]
-
     user = models.ForeignKey(
         CustomUser,
         on_delete=models.CASCADE,
         related_name='deposits',
         help_text="User who made the deposit"
     )
-    amount = models.DecimalField(
-        max_digits=20,
-        decimal_places=8,
+    amount = NanoTonField(
         validators=[MinValueValidator(Decimal('0.00'))],
         help_text="Deposit amount in TON"
     )
@@ -178,18 +294,23 @@ class Deposit(models.Model):
     )
     status = models.CharField(
         max_length=20,
-        choices=STATUS_CHOICES,
-        default='PENDING',
+        choices=DepositStatus.choices,
+        default=DepositStatus.PENDING,
         help_text="Current status of the deposit"
     )
-    comment_code = models.CharField(
-        max_length=255,
+    comment_code = models.GeneratedField(
+        expression=Concat(models.Value('user_'), Cast('user_id', models.CharField(max_length=20))),
+        output_field=models.CharField(max_length=255),
+        db_persist=True,
+        db_index=True,
         help_text="Unique comment code used for deposit identification"
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     confirmed_at = models.DateTimeField(null=True, blank=True, help_text="When the deposit was confirmed")
 
+    objects = DepositManager()
+
     class Meta:
         verbose_name = "Deposit"
         verbose_name_plural = "Deposits"
@@ -199,6 +320,9 @@ class Deposit(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['user', 'status']),
         ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(amount__gte=0), name='deposit_amount_nonneg'),
+        ]
 
     def __str__(self):
-        return f"Deposit #{self.id} - {self.user.username} - {self.amount} TON ({self.status})"
+        return f"Deposit #{self.id} - {self.user.username} - {self.amount:f} TON ({self.status})"
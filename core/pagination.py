@@ -0,0 +1,84 @@
+"""
+Paginators for large marketplace tables.
+"""
+import hashlib
+import time
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+# Bounds how long a missed invalidation (a queryset update(), another
+# process's local-memory cache) can keep serving stale counts and ETags
+COUNT_VERSION_TIMEOUT = 300
+
+
+def _count_version_key(model) -> str:
+    return f"paginator_count_version_{model._meta.label_lower}"
+
+
+def get_count_version(model) -> int:
+    """
+    Current count version for ``model``; changes on every
+    ``invalidate_cached_counts()`` call and at least every
+    ``COUNT_VERSION_TIMEOUT`` seconds.
+
+    A fresh version is a timestamp, so an expired version is never reused.
+    """
+    return cache.get_or_set(_count_version_key(model), time.time_ns, COUNT_VERSION_TIMEOUT)
+
+
+def invalidate_cached_counts(model) -> None:
+    """
+    Invalidate every cached paginator count for ``model``'s querysets.
+
+    Bumps the model's count version, which is part of every count cache key,
+    so stale entries are never read again and simply expire.
+    """
+    cache.set(_count_version_key(model), time.time_ns(), COUNT_VERSION_TIMEOUT)
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that caches the total count instead of running COUNT(*) on
+    every page view.
+
+    Counts are cached per query for ``count_cache_timeout`` seconds and can
+    be dropped early with ``invalidate_cached_counts()``.
+    """
+    count_cache_timeout = 30
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        try:
+            sql = str(self.object_list.query)
+        except EmptyResultSet:
+            return 0
+        version = get_count_version(self.object_list.model)
+        cache_key = f"paginator_count_{version}_{hashlib.md5(sql.encode()).hexdigest()}"
+        return cache.get_or_set(cache_key, self.object_list.count, self.count_cache_timeout)
+
+
+class PkSubqueryPaginator(CachedCountPaginator):
+    """
+    Paginator that runs the OFFSET scan over primary keys only.
+
+    The page's keys are sliced from a ``values_list('pk')`` query and the
+    rows are then re-fetched with ``pk__in``, so skipped rows never carry
+    their other columns or joins through the scan.
+    """
+
+    def page(self, number):
+        if not isinstance(self.object_list, QuerySet):
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        pks = list(self.object_list.values_list('pk', flat=True)[bottom:top])
+        # Keeps the original ordering, applied only to this page's rows
+        return self._get_page(self.object_list.filter(pk__in=pks), number, self)
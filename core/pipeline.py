@@ -1,6 +1,10 @@
 """
 Social auth pipeline functions for Steam authentication.
 """
+import re
+
+# Matches a bare 64-bit Steam ID or a steamcommunity.com URL ending in one
+_STEAM_ID_RE = re.compile(r'^(?:https?://steamcommunity\.com/(?:openid/id|profiles|id)/)?(\d{17})/?$')
 
 
 def save_steam_id(strategy, details, backend, user=None, *args, **kwargs):
@@ -8,38 +12,33 @@ def save_steam_id(strategy, details, backend, user=None, *args, **kwargs):
     Pipeline function to save Steam ID to CustomUser model.
     Steam OpenID returns the Steam ID in the response.
     """
-    if backend.name == 'steam' and user:
-        response = kwargs.get('response', {})
-        
-        # Steam ID can be in different places depending on the response
-        steam_id = None
-        if isinstance(response, dict):
-            steam_id = response.get('steamid') or response.get('personaname')
-        
-        if not steam_id:
-            steam_id = kwargs.get('uid')
-        
-        # If uid is a URL, extract the Steam ID from it
-        if not steam_id and kwargs.get('uid'):
-            uid = kwargs['uid']
-            if isinstance(uid, str) and 'steamcommunity.com' in uid:
-                steam_id = uid.split('/')[-1]
-            else:
-                steam_id = str(uid)
-        
-        # Also check username field which might contain Steam ID
-        if not steam_id and kwargs.get('username'):
-            username = kwargs['username']
-            if isinstance(username, str) and 'steamcommunity.com' in username:
-                steam_id = username.split('/')[-1]
-            elif username.isdigit():
-                steam_id = username
-        
+    # Nothing to do for other backends or users that are already linked
+    if backend.name != 'steam' or user is None:
+        return {'user': user}
+    if strategy.session_get('steam_id_linked') == user.pk or user.steam_id:
+        return {'user': user}
+    
+    # Steam ID can be in different places depending on the response
+    steam_id = None
+    response = kwargs.get('response', {})
+    if isinstance(response, dict):
+        steam_id = response.get('steamid')
+    
+    # Otherwise extract it from the uid or username (plain ID or profile URL)
+    if not steam_id:
+        for candidate in (kwargs.get('uid'), kwargs.get('username')):
+            match = _STEAM_ID_RE.match(str(candidate or '').strip())
+            if match:
+                steam_id = match.group(1)
+                break
+    
+    if steam_id:
+        # Ensure it's a string and clean it
+        steam_id = str(steam_id).strip()
         if steam_id:
-            # Ensure it's a string and clean it
-            steam_id = str(steam_id).strip()
-            if steam_id and not user.steam_id:
-                user.steam_id = steam_id
-                user.save(update_fields=['steam_id'])
+            user.steam_id = steam_id
+            user.save(update_fields=['steam_id'])
+            # Remember the link for the rest of this session
+            strategy.session_set('steam_id_linked', user.pk)
     
     return {'user': user}
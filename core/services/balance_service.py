@@ -1,81 +1,165 @@
 """
 Balance service for handling deposits and balance operations.
 """
-from django.db import transaction
+from collections import defaultdict
+from functools import lru_cache
+from django.db import connection, transaction
 from django.core.exceptions import ValidationError
-from django.utils import timezone
 from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+from core.fields import TON_DECIMAL_PLACES, to_nano
 from core.models import CustomUser, Deposit
 
+# Balance increment issued straight through the DB-API cursor; this is the
+# hottest statement in the deposit path, so it skips ORM query compilation
+_ADD_BALANCE_SQL = "UPDATE core_customuser SET balance_active = balance_active + %s WHERE id = %s"
 
-def process_deposit(user_id: int, amount: Decimal, tx_hash: str, comment_code: str = None) -> Deposit:
+
+def _add_balance(user_id: int, amount_nano: int) -> int:
     """
-    Process a deposit transaction and add funds to user's active balance.
+    Add nanoTON to a user's active balance.
     
-    This function uses database transactions to ensure atomicity and prevent
-    race conditions when updating user balances.
+    Returns:
+        Number of user rows updated (0 if the user doesn't exist)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_ADD_BALANCE_SQL, [amount_nano, user_id])
+        return cursor.rowcount
+
+
+def _add_balances(totals: Dict[int, int]) -> int:
+    """
+    Add nanoTON to several users' active balances in one executemany batch.
     
     Args:
-        user_id: ID of the user making the deposit
-        amount: Amount to deposit (must be positive)
-        tx_hash: Blockchain transaction hash (must be unique)
-        comment_code: Optional comment code used for deposit identification
+        totals: Mapping of user ID to nanoTON amount
     
     Returns:
-        Deposit object that was created/updated
+        Number of user rows updated
+    """
+    with connection.cursor() as cursor:
+        cursor.executemany(_ADD_BALANCE_SQL, [(total, user_id) for user_id, total in totals.items()])
+        return cursor.rowcount
+
+
+def _validate_deposit(amount: Decimal, tx_hash: str) -> None:
+    """
+    Validate a deposit's amount and transaction hash.
     
     Raises:
-        ValidationError: If validation fails (negative amount, duplicate tx_hash, etc.)
-        CustomUser.DoesNotExist: If user doesn't exist
+        ValidationError: If the amount isn't positive, has digits below
+            1 nanoTON, or the tx_hash is missing
     """
     if amount <= 0:
         raise ValidationError("Deposit amount must be greater than zero.")
+    try:
+        to_nano(amount)
+    except ValueError:
+        raise ValidationError(f"Deposit amount can have at most {TON_DECIMAL_PLACES} decimal places.")
     
     if not tx_hash or not tx_hash.strip():
         raise ValidationError("Transaction hash is required.")
+
+
+def process_deposit(user_id: int, amount: Decimal, tx_hash: str) -> Optional[Deposit]:
+    """
+    Process a deposit transaction and add funds to user's active balance.
+    
+    This function uses database transactions to ensure atomicity and prevent
+    race conditions when updating user balances. Processing is idempotent per
+    tx_hash: a repeated delivery of the same transaction changes nothing.
+    
+    Args:
+        user_id: ID of the user making the deposit
+        amount: Amount to deposit (must be positive)
+        tx_hash: Blockchain transaction hash
+    
+    Returns:
+        Deposit object that was created, or None if tx_hash was already processed
+    
+    Raises:
+        ValidationError: If validation fails (non-positive or sub-nanoTON amount,
+            missing tx_hash)
+        CustomUser.DoesNotExist: If user doesn't exist
+    """
+    _validate_deposit(amount, tx_hash)
     
     # Use atomic transaction to ensure data consistency
     with transaction.atomic():
-        # Get user and lock the row for update to prevent race conditions
-        try:
-            user = CustomUser.objects.select_for_update().get(id=user_id)
-        except CustomUser.DoesNotExist:
+        # Create the deposit record already confirmed; a tx_hash that was
+        # already processed inserts nothing and must not credit the balance
+        deposit = Deposit.objects.insert_confirmed(user_id, amount, tx_hash)
+        if deposit is None:
+            return None
+        
+        # Add funds in a single UPDATE; the database does the integer
+        # nanoTON arithmetic, so no row lock or read-modify-write is needed
+        updated = _add_balance(user_id, to_nano(amount))
+        if updated == 0:
             raise CustomUser.DoesNotExist(f"User with ID {user_id} does not exist.")
         
-        # Check if transaction hash already exists
-        existing_deposit = Deposit.objects.filter(tx_hash=tx_hash).first()
-        if existing_deposit:
-            raise ValidationError(f"Transaction hash {tx_hash} already exists. This deposit may have already been processed.")
+        return deposit
+
+
+def process_deposits_bulk(rows: Iterable[Dict]) -> List[Deposit]:
+    """
+    Process a batch of confirmed deposits in a constant number of queries.
+    
+    Intended for blockchain watchers that confirm many transactions at once.
+    All deposit rows are written with one ``INSERT ... ON CONFLICT DO
+    NOTHING`` and the balance deltas of the rows actually inserted are
+    summed per user and applied in a single executemany batch.
+    
+    Args:
+        rows: Iterable of dicts with ``user_id``, ``amount`` and ``tx_hash`` keys
+    
+    Returns:
+        List of Deposit objects that were created. Transaction hashes that
+        were already processed, concurrently or earlier (or repeat within the
+        batch), are skipped.
+    
+    Raises:
+        ValidationError: If a row fails validation
+        CustomUser.DoesNotExist: If any referenced user doesn't exist
+    """
+    deposits = {}
+    for row in rows:
+        user_id = row['user_id']
+        amount = row['amount']
+        tx_hash = row['tx_hash']
         
-        # Generate comment code if not provided
-        if not comment_code:
-            comment_code = f"user_{user_id}"
+        _validate_deposit(amount, tx_hash)
         
-        # Create deposit record
-        deposit = Deposit.objects.create(
-            user=user,
-            amount=amount,
-            tx_hash=tx_hash,
-            comment_code=comment_code,
-            status='PENDING'
-        )
+        deposits.setdefault(tx_hash, (user_id, amount, tx_hash))
+    
+    if not deposits:
+        return []
+    
+    with transaction.atomic():
+        # Hashes that were already processed insert nothing, so only the
+        # returned rows are credited
+        new_deposits = Deposit.objects.insert_confirmed_many(list(deposits.values()))
+        if not new_deposits:
+            return []
         
-        # Update user's active balance
-        user.balance_active += amount
-        user.save(update_fields=['balance_active'])
+        totals = defaultdict(int)
+        for deposit in new_deposits:
+            totals[deposit.user_id] += to_nano(deposit.amount)
         
-        # Update deposit status to confirmed
-        deposit.status = 'CONFIRMED'
-        deposit.confirmed_at = timezone.now()
-        deposit.save(update_fields=['status', 'confirmed_at'])
+        updated = _add_balances(totals)
+        if updated != len(totals):
+            raise CustomUser.DoesNotExist("One or more users in the deposit batch do not exist.")
         
-        return deposit
+        return new_deposits
 
 
+@lru_cache(maxsize=8192)
 def get_user_comment_code(user_id: int) -> str:
     """
     Get the unique comment code for a user.
     
+    Matches the value the database generates for Deposit.comment_code.
+    
     Args:
         user_id: ID of the user
     
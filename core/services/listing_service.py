@@ -0,0 +1,44 @@
+"""
+Listing service for seller-side listing lookups.
+"""
+from typing import FrozenSet
+from django.core.cache import cache
+from core.models import SkinListing, ListingStatus
+
+# Invalidated explicitly whenever a listing leaves or enters ACTIVE
+ACTIVE_ASSETS_CACHE_TIMEOUT = 3600
+
+
+def _active_assets_key(user_id: int) -> str:
+    return f"active_assets_{user_id}"
+
+
+def get_active_asset_ids(user_id: int) -> FrozenSet[str]:
+    """
+    Get the asset IDs a user currently has listed for sale.
+    
+    Args:
+        user_id: ID of the seller
+    
+    Returns:
+        Frozen set of asset IDs with an ACTIVE listing, for O(1)
+        membership tests against the inventory
+    """
+    cache_key = _active_assets_key(user_id)
+    asset_ids = cache.get(cache_key)
+    if asset_ids is None:
+        asset_ids = frozenset(
+            SkinListing.objects.filter(
+                seller_id=user_id,
+                status=ListingStatus.ACTIVE
+            ).values_list('asset_id', flat=True)
+        )
+        cache.set(cache_key, asset_ids, ACTIVE_ASSETS_CACHE_TIMEOUT)
+    return asset_ids
+
+
+def invalidate_active_asset_ids(user_id: int) -> None:
+    """
+    Drop the cached active asset IDs after a user's listings change.
+    """
+    cache.delete(_active_assets_key(user_id))
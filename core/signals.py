@@ -0,0 +1,24 @@
+"""
+Signal handlers keeping listing caches in sync with the database.
+"""
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core.models import SkinListing
+from core.pagination import invalidate_cached_counts
+from core.services.listing_service import invalidate_active_asset_ids
+
+
+@receiver(post_save, sender=SkinListing)
+@receiver(post_delete, sender=SkinListing)
+def invalidate_listing_caches(sender, instance, **kwargs):
+    """
+    Drop the seller's cached active asset IDs and bump the listing count
+    version (paginator counts, browse ETags) after any listing save or
+    delete, including admin edits.
+
+    Runs on commit so a concurrent request can't re-cache the old rows.
+    """
+    transaction.on_commit(partial(invalidate_active_asset_ids, instance.seller_id))
+    transaction.on_commit(partial(invalidate_cached_counts, SkinListing))
@@ -2,21 +2,48 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import logout
 from django.contrib import messages
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.cache import cache_page
+from django.views.decorators.http import condition, require_http_methods
 from django.conf import settings as django_settings
 from django.db import transaction
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from functools import wraps
+import hashlib
 from decimal import Decimal, InvalidOperation
-from .models import CustomUser, SkinListing, Deposit, Order
+from .fields import TON_DECIMAL_PLACES, to_nano
+from .models import CustomUser, UserProfile, SkinListing, Deposit, Order, ListingStatus, OrderStatus
 from services.steam_service import get_user_inventory
 from core.services.balance_service import get_user_comment_code
+from core.services.listing_service import get_active_asset_ids, invalidate_active_asset_ids
+from .pagination import get_count_version, invalidate_cached_counts
 
 
+def _cache_page_for_anonymous(timeout):
+    """
+    Like ``cache_page``, but only for anonymous requests with no pending
+    messages; pages showing a user's balance or a flash message are never
+    cached.
+    """
+    def decorator(view_func):
+        cached_view = cache_page(timeout)(view_func)
+        
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.user.is_authenticated or len(messages.get_messages(request)):
+                return view_func(request, *args, **kwargs)
+            return cached_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@_cache_page_for_anonymous(30)
 def home(request):
     """
     Home page showing active listings.
     """
     # Get active listings
-    listings = SkinListing.objects.filter(status='ACTIVE').select_related('seller').order_by('-created_at')[:8]
+    listings = SkinListing.objects.filter(status=ListingStatus.ACTIVE).order_by('-created_at')[:8]
     
     context = {
         'listings': listings,
@@ -31,9 +58,9 @@ def profile_settings(request):
     Profile Settings view where users can update their Steam API key,
     trade URL, and wallet address.
     """
+    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    
     if request.method == 'POST':
-        user = request.user
-        
         # Get form data
         steam_api_key = request.POST.get('steam_api_key', '').strip()
         trade_url = request.POST.get('trade_url', '').strip()
@@ -53,17 +80,18 @@ def profile_settings(request):
             for error in errors:
                 messages.error(request, error)
         else:
-            # Update user fields
-            user.steam_api_key = steam_api_key
-            user.trade_url = trade_url
-            user.wallet_address = wallet_address
-            user.save(update_fields=['steam_api_key', 'trade_url', 'wallet_address'])
+            # Update profile fields
+            profile.steam_api_key = steam_api_key
+            profile.trade_url = trade_url
+            profile.wallet_address = wallet_address
+            profile.save(update_fields=['steam_api_key', 'trade_url', 'wallet_address'])
             messages.success(request, "Profile settings saved successfully!")
             return redirect('core:profile_settings')
     
     # GET request - show form with current values
     context = {
         'user': request.user,
+        'profile': profile,
     }
     return render(request, 'core/profile_settings.html', context)
 
@@ -101,14 +129,19 @@ def sell_item(request):
                 price_decimal = Decimal(price_ton)
                 if price_decimal <= 0:
                     errors.append("Price must be greater than 0.")
-            except (InvalidOperation, ValueError):
+                else:
+                    # Prices are stored in whole nanoTON
+                    to_nano(price_decimal)
+            except InvalidOperation:
                 errors.append("Invalid price format.")
+            except ValueError:
+                errors.append(f"Price can have at most {TON_DECIMAL_PLACES} decimal places.")
         
         # Check if item is already listed
         existing_listing = SkinListing.objects.filter(
             seller=user,
             asset_id=asset_id,
-            status='ACTIVE'
+            status=ListingStatus.ACTIVE
         ).first()
         
         if existing_listing:
@@ -125,7 +158,7 @@ def sell_item(request):
                     asset_id=asset_id,
                     market_name=market_name,
                     price_ton=price_decimal,
-                    status='ACTIVE'
+                    status=ListingStatus.ACTIVE
                 )
                 messages.success(request, f"Item '{market_name}' listed successfully for {price_ton} TON!")
                 return redirect('core:my_listings')
@@ -143,14 +176,9 @@ def sell_item(request):
         # Fetch inventory (uses caching to reduce API calls)
         inventory = get_user_inventory(user.steam_id, force_refresh=force_refresh)
         
-        # Filter out items that are already listed
-        active_listings = SkinListing.objects.filter(
-            seller=user,
-            status='ACTIVE'
-        ).values_list('asset_id', flat=True)
-        
         # Remove already listed items from inventory
-        inventory = [item for item in inventory if item.get('asset_id') not in active_listings]
+        active_asset_ids = get_active_asset_ids(user.id)
+        inventory = [item for item in inventory if item.get('asset_id') not in active_asset_ids]
         
         if not inventory:
             messages.info(request, "No tradable items available to list, or all items are already listed.")
@@ -199,26 +227,98 @@ def deposit_funds(request):
     return render(request, 'core/deposit_funds.html', context)
 
 
-from django.core.paginator import Paginator
+BROWSE_PAGE_SIZE = 12
+MY_LISTINGS_PAGE_SIZE = 25
+
+
+def _listing_cursor(listing):
+    """
+    Encode a listing's (created_at, id) sort key as a keyset cursor.
+    """
+    return f"{listing.created_at.isoformat()}_{listing.id}"
+
+
+def _parse_listing_cursor(cursor):
+    """
+    Decode a keyset cursor into (created_at, id), or None if it's invalid.
+    """
+    created_at, _, listing_id = cursor.rpartition('_')
+    try:
+        created_at = parse_datetime(created_at)
+        listing_id = int(listing_id)
+    except ValueError:
+        return None
+    if created_at is None:
+        return None
+    return created_at, listing_id
+
+
+def _listing_keyset_page(request, listings_list, page_size):
+    """
+    Fetch one keyset-paginated page of listings for the request's ``after`` cursor.
+    
+    Uses keyset pagination on (created_at, id): each page seeks past the
+    last listing of the previous one instead of using OFFSET, so deep
+    pages cost the same as the first.
+    
+    Returns:
+        Tuple of (listings, next_cursor, is_first_page); next_cursor is
+        None on the last page
+    """
+    listings_list = listings_list.order_by('-created_at', '-id')
+    
+    # Seek past the last listing of the previous page
+    cursor = _parse_listing_cursor(request.GET.get('after', ''))
+    if cursor:
+        created_at, listing_id = cursor
+        listings_list = listings_list.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=listing_id)
+        )
+    
+    # Fetch one extra row to detect whether there is a next page
+    listings = list(listings_list[:page_size + 1])
+    next_cursor = None
+    if len(listings) > page_size:
+        listings = listings[:page_size]
+        next_cursor = _listing_cursor(listings[-1])
+    return listings, next_cursor, cursor is None
+
+
+def _browse_listings_etag(request):
+    """
+    ETag for browse pages: changes whenever active listings are added or
+    removed, or the navbar (user, balance) would render differently.
+    """
+    # Rendering consumes pending messages, so never answer those with a 304
+    if len(messages.get_messages(request)):
+        return None
+    # Bumped on every listing save/delete (see core.signals) and expires
+    # after COUNT_VERSION_TIMEOUT, so no query is needed here
+    version = get_count_version(SkinListing)
+    user = request.user
+    key = f"{user.pk}:{user.balance_active}:{version}"
+    return hashlib.md5(key.encode()).hexdigest()
+
 
 @login_required
+@condition(etag_func=_browse_listings_etag)
 def browse_listings(request):
     """
     Browse all active listings.
     """
-    listings_list = SkinListing.objects.filter(status='ACTIVE').select_related('seller').order_by('-created_at')
+    listings_list = SkinListing.objects.filter(status=ListingStatus.ACTIVE)
     
     # Optional: Add search/filter functionality
     search_query = request.GET.get('search', '').strip()
     if search_query:
         listings_list = listings_list.filter(market_name__icontains=search_query)
-        
-    paginator = Paginator(listings_list, 12) # Show 12 listings per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    
+    listings, next_cursor, is_first_page = _listing_keyset_page(request, listings_list, BROWSE_PAGE_SIZE)
     
     context = {
-        'page_obj': page_obj,
+        'listings': listings,
+        'next_cursor': next_cursor,
+        'is_first_page': is_first_page,
         'search_query': search_query,
     }
     return render(request, 'core/browse_listings.html', context)
@@ -229,7 +329,7 @@ def listing_detail(request, listing_id):
     """
     View listing details and purchase option.
     """
-    listing = get_object_or_404(SkinListing.objects.select_related('seller'), id=listing_id, status='ACTIVE')
+    listing = get_object_or_404(SkinListing.objects.select_related('seller'), id=listing_id, status=ListingStatus.ACTIVE)
     user = request.user
     
     # Check if user is trying to buy their own listing
@@ -249,48 +349,61 @@ def purchase_listing(request, listing_id):
     """
     Purchase a listing - creates an order and freezes funds.
     """
-    listing = get_object_or_404(SkinListing.objects.select_related('seller'), id=listing_id, status='ACTIVE')
+    listing = get_object_or_404(SkinListing, id=listing_id, status=ListingStatus.ACTIVE)
     user = request.user
     
     # Validation
-    if listing.seller == user:
+    if listing.seller_id == user.id:
         messages.error(request, "You cannot purchase your own listing.")
         return redirect('core:listing_detail', listing_id=listing_id)
     
     if user.balance_active < listing.price_ton:
-        messages.error(request, f"Insufficient balance. You need {listing.price_ton} TON, but you have {user.balance_active} TON.")
+        messages.error(request, f"Insufficient balance. You need {listing.price_ton:f} TON, but you have {user.balance_active:f} TON.")
         return redirect('core:deposit_funds')
     
     # Use atomic transaction
     try:
         with transaction.atomic():
-            # Lock user and seller rows
-            buyer = CustomUser.objects.select_for_update().get(id=user.id)
-            seller = CustomUser.objects.select_for_update().get(id=listing.seller.id)
-            listing_obj = SkinListing.objects.select_for_update().get(id=listing_id, status='ACTIVE')
+            # Mark listing as sold only if it is still active at the price
+            # shown; a concurrent purchase or change updates no row
+            sold = SkinListing.objects.filter(
+                id=listing_id,
+                status=ListingStatus.ACTIVE,
+                price_ton=listing.price_ton
+            ).update(status=ListingStatus.SOLD)
+            if sold != 1:
+                messages.error(request, "This listing is no longer available.")
+                return redirect('core:browse_listings')
+            listing.status = ListingStatus.SOLD
             
-            # Double-check balance
-            if buyer.balance_active < listing_obj.price_ton:
+            # Freeze buyer's funds in a single conditional UPDATE; no row
+            # is updated if the balance no longer covers the price
+            price_nano = to_nano(listing.price_ton)
+            updated = CustomUser.objects.filter(
+                id=user.id,
+                balance_active__gte=listing.price_ton
+            ).update(
+                balance_active=F('balance_active') - price_nano,
+                balance_frozen=F('balance_frozen') + price_nano
+            )
+            if updated != 1:
+                # Undo the listing update
+                transaction.set_rollback(True)
                 messages.error(request, "Insufficient balance. Please deposit more funds.")
                 return redirect('core:deposit_funds')
             
-            # Freeze buyer's funds
-            buyer.balance_active -= listing_obj.price_ton
-            buyer.balance_frozen += listing_obj.price_ton
-            buyer.save(update_fields=['balance_active', 'balance_frozen'])
-            
             # Create order
             order = Order.objects.create(
-                buyer=buyer,
-                seller=seller,
-                listing=listing_obj,
-                amount=listing_obj.price_ton,
-                status='PAID'
+                buyer_id=user.id,
+                seller_id=listing.seller_id,
+                listing=listing,
+                amount=listing.price_ton,
+                status=OrderStatus.PAID
             )
-            
-            # Mark listing as sold
-            listing_obj.status = 'SOLD'
-            listing_obj.save(update_fields=['status'])
+            # update() skips the SkinListing post_save signal
+            transaction.on_commit(lambda: invalidate_active_asset_ids(listing.seller_id))
+            transaction.on_commit(lambda: invalidate_cached_counts(SkinListing))
+            transaction.on_commit(lambda: invalidate_cached_counts(Order))
             
             messages.success(request, f"Order created successfully! Order ID: #{order.id}")
             return redirect('core:order_detail', order_id=order.id)
@@ -306,15 +419,20 @@ def my_listings(request):
     View user's own listings.
     """
     user = request.user
-    listings = SkinListing.objects.filter(seller=user).select_related('seller').order_by('-created_at')
+    listings_list = SkinListing.objects.filter(seller=user)
     
     # Filter by status if provided
     status_filter = request.GET.get('status', '')
     if status_filter:
-        listings = listings.filter(status=status_filter)
+        listings_list = listings_list.filter(status=status_filter)
+    
+    # Paginated like browse_listings, so power sellers never load every row
+    listings, next_cursor, is_first_page = _listing_keyset_page(request, listings_list, MY_LISTINGS_PAGE_SIZE)
     
     context = {
         'listings': listings,
+        'next_cursor': next_cursor,
+        'is_first_page': is_first_page,
         'status_filter': status_filter,
     }
     return render(request, 'core/my_listings.html', context)
@@ -326,9 +444,9 @@ def cancel_listing(request, listing_id):
     """
     Cancel a listing.
     """
-    listing = get_object_or_404(SkinListing, id=listing_id, seller=request.user, status='ACTIVE')
+    listing = get_object_or_404(SkinListing, id=listing_id, seller=request.user, status=ListingStatus.ACTIVE)
     
-    listing.status = 'CANCELLED'
+    listing.status = ListingStatus.CANCELLED
     listing.save(update_fields=['status'])
     
     messages.success(request, "Listing cancelled successfully.")
@@ -342,17 +460,23 @@ def my_orders(request):
     """
     user = request.user
     
-    # Get orders as buyer
-    orders_as_buyer = Order.objects.filter(buyer=user).select_related('seller', 'listing').order_by('-created_at')
-    
-    # Get orders as seller
-    orders_as_seller = Order.objects.filter(seller=user).select_related('buyer', 'listing').order_by('-created_at')
+    # Get orders on both sides of the trade in one query, loading only the
+    # columns the template renders
+    orders = Order.objects.filter(
+        Q(buyer=user) | Q(seller=user)
+    ).select_related('buyer', 'seller', 'listing').only(
+        'id', 'amount', 'status', 'created_at', 'buyer', 'seller', 'listing',
+        'buyer__username', 'seller__username', 'listing__market_name'
+    ).order_by('-created_at')
     
     # Filter by status if provided
     status_filter = request.GET.get('status', '')
     if status_filter:
-        orders_as_buyer = orders_as_buyer.filter(status=status_filter)
-        orders_as_seller = orders_as_seller.filter(status=status_filter)
+        orders = orders.filter(status=status_filter)
+    
+    # Split into orders as buyer and as seller
+    orders_as_buyer = [order for order in orders if order.buyer_id == user.id]
+    orders_as_seller = [order for order in orders if order.seller_id == user.id]
     
     context = {
         'orders_as_buyer': orders_as_buyer,
@@ -369,7 +493,7 @@ def order_detail(request, order_id):
     """
     user = request.user
     order = get_object_or_404(
-        Order.objects.select_related('buyer', 'seller', 'listing'),
+        Order.objects.select_related('buyer', 'buyer__profile', 'seller', 'listing'),
         id=order_id
     )
     
@@ -386,48 +510,42 @@ def order_detail(request, order_id):
         action = request.POST.get('action')
         
         if is_seller and action == 'mark_sent':
-            if order.status == 'PAID':
+            if order.status == OrderStatus.PAID:
                 steam_trade_id = request.POST.get('steam_trade_id', '').strip()
                 if steam_trade_id:
-                    with transaction.atomic():
-                        # Lock order row
-                        order_obj = Order.objects.select_for_update().get(id=order.id)
-                        if order_obj.status == 'PAID':
-                            order_obj.status = 'SENT'
-                            order_obj.steam_trade_id = steam_trade_id
-                            order_obj.save(update_fields=['status', 'steam_trade_id'])
-                            messages.success(request, "Order marked as sent. Waiting for buyer confirmation.")
-                            return redirect('core:order_detail', order_id=order.id)
+                    # Flip the status only if the order is still PAID
+                    updated = Order.objects.filter(id=order.id, status=OrderStatus.PAID).update(
+                        status=OrderStatus.SENT,
+                        steam_trade_id=steam_trade_id
+                    )
+                    if updated:
+                        messages.success(request, "Order marked as sent. Waiting for buyer confirmation.")
+                    else:
+                        messages.error(request, "Order status has changed. Please review the order.")
+                    return redirect('core:order_detail', order_id=order.id)
                 else:
                     messages.error(request, "Please provide the Steam Trade ID.")
             else:
                  messages.error(request, "Invalid status for this action.")
 
         elif is_buyer and action == 'confirm_received':
-            if order.status == 'SENT':
+            if order.status == OrderStatus.SENT:
                 with transaction.atomic():
-                    # Lock rows
+                    # Lock order row
                     order_obj = Order.objects.select_for_update().get(id=order.id)
-                    seller = CustomUser.objects.select_for_update().get(id=order.seller.id)
-                    buyer = CustomUser.objects.select_for_update().get(id=order.buyer.id)
                     
-                    if order_obj.status == 'SENT':
-                        # Release funds
-                        # Move from buyer frozen to seller active
-                        # (Originally buyer active reduced, frozen increased. So now we reduce frozen and add to seller active)
-                        
-                        # Wait, in purchase_listing:
-                        # buyer.balance_active -= price
-                        # buyer.balance_frozen += price
-                        
-                        # So here:
-                        buyer.balance_frozen -= order_obj.amount
-                        seller.balance_active += order_obj.amount
-                        
-                        buyer.save(update_fields=['balance_frozen'])
-                        seller.save(update_fields=['balance_active'])
+                    if order_obj.status == OrderStatus.SENT:
+                        # Release funds: move the amount frozen at purchase
+                        # from buyer's frozen balance to seller's active balance
+                        amount_nano = to_nano(order_obj.amount)
+                        CustomUser.objects.filter(id=order_obj.buyer_id).update(
+                            balance_frozen=F('balance_frozen') - amount_nano
+                        )
+                        CustomUser.objects.filter(id=order_obj.seller_id).update(
+                            balance_active=F('balance_active') + amount_nano
+                        )
                         
-                        order_obj.status = 'COMPLETED'
+                        order_obj.status = OrderStatus.COMPLETED
                         order_obj.save(update_fields=['status'])
                         
                         messages.success(request, "Order completed! Funds released to seller.")
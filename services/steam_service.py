@@ -1,24 +1,202 @@
 """
 Steam service for fetching user inventory.
-Uses Direct Steam API with STRICT caching to prevent rate limits.
+Uses Direct Steam API with STRICT caching to prevent rate limits; stale
+inventories are served from cache while they refresh in the background.
 """
+import logging
+import orjson
 import requests
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Optional
 from django.core.cache import cache
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 # Cache timeout: 24 hours
-# We rely on this heavily. 
-# API is ONLY called if user explicitly clicks "Refresh" OR cache is empty.
-CACHE_TIMEOUT = 86400
+# We rely on this heavily. Within this window a cached inventory is always
+# served; once it is older than FRESH_TIMEOUT it is also refreshed in the
+# background. The API is called in the request only if the user clicks
+# "Refresh" OR cache is empty.
+CACHE_TIMEOUT = settings.STEAM_INVENTORY_STALE_TIMEOUT
+
+# Inventory older than this is refreshed in the background (stale-while-revalidate)
+FRESH_TIMEOUT = settings.STEAM_INVENTORY_CACHE_TIMEOUT
+
+# Steam request timeout (seconds, applied to connect and to read) and retry policy
+FETCH_TIMEOUT = 10
+FETCH_RETRIES = 2
+FETCH_BACKOFF_FACTOR = 1
+
+# Longest a fetch can take: every attempt hitting both timeouts, plus the
+# backoff sleeps between them. Retry-After is ignored so Steam can't
+# stretch it.
+FETCH_MAX_DURATION = (
+    (FETCH_RETRIES + 1) * 2 * FETCH_TIMEOUT
+    + sum(FETCH_BACKOFF_FACTOR * 2 ** i for i in range(FETCH_RETRIES))
+)
+
+# Only one fetch per Steam ID runs at a time (dogpile protection); the lock
+# outlives the longest fetch but still expires on its own if its holder
+# dies, and waiters give up after a while
+FETCH_LOCK_TIMEOUT = FETCH_MAX_DURATION + 10
+FETCH_LOCK_WAIT = 10
+FETCH_LOCK_POLL_INTERVAL = 0.2
+
+_REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='steam-refresh')
+
+# Shared session so repeat calls reuse pooled keep-alive connections to
+# Steam instead of paying a TCP + TLS handshake each time. Rate limits and
+# transient errors are retried with backoff; the last response is returned
+# (rather than raised) once retries run out.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=FETCH_RETRIES,
+        backoff_factor=FETCH_BACKOFF_FACTOR,
+        status_forcelist=[429, 502, 503],
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    ),
+))
+
+# Request parameters and headers shared by every inventory fetch; treat as read-only
+_PARAMS = {'l': 'english', 'count': 5000}
+_HEADERS = {'User-Agent': settings.STEAM_USER_AGENT}
+
+ICON_URL_PREFIX = "https://community.cloudflare.steamstatic.com/economy/image/"
+
+
+def _build_item(asset: Dict, description: Dict) -> Dict:
+    """
+    Build an inventory item from a Steam asset and its description.
+    """
+    market_name = description.get('market_hash_name', 'Unknown')
+    icon_hash = description.get('icon_url', '')
+    return {
+        'asset_id': asset.get('assetid'),
+        'market_name': market_name,
+        'market_hash_name': market_name,
+        'icon_url': f"{ICON_URL_PREFIX}{icon_hash}" if icon_hash else '',
+        'tradable': 1
+    }
+
+
+def _fetch_inventory(steam_id: str) -> List[Dict]:
+    """
+    Call the Steam API for a validated Steam ID and update the caches.
+    """
+    url = settings.STEAM_INVENTORY_URL_TMPL.format(steam_id=steam_id)
+    
+    logger.debug("Fetching from Direct Steam API: %s", url)
+    
+    # Retries for 429 (Rate Limit) and connection errors happen in _SESSION
+    try:
+        response = _SESSION.get(url, params=_PARAMS, headers=_HEADERS, timeout=FETCH_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Connection Error: {e}")
+    
+    if response.status_code == 429:
+        logger.warning("Steam 429 Rate Limit hit for %s", steam_id)
+        raise Exception("Steam is rate-limiting requests. Please wait a few minutes.")
+    
+    if response.status_code == 403:
+        raise Exception("Inventory is Private. Set to Public.")
+        
+    if response.status_code != 200:
+        raise Exception(f"Steam Error {response.status_code}")
+        
+    data = orjson.loads(response.content)
+    if not data or 'assets' not in data:
+        inventory = [] # Empty inventory
+    else:
+        # Parse (keep tradable items only)
+        descriptions_map = {str(desc.get('classid')): desc for desc in data.get('descriptions', ())}
+        inventory = [
+            _build_item(asset, description)
+            for asset in data['assets']
+            if (description := descriptions_map.get(str(asset.get('classid'))))
+            and description.get('tradable') == 1
+        ]
+    
+    # Update Cache
+    logger.debug("Caching %d items.", len(inventory))
+    cache.set(f"inventory_{steam_id}", inventory, CACHE_TIMEOUT)
+    cache.set(f"inventory_fresh_{steam_id}", True, FRESH_TIMEOUT)
+    return inventory
+
+
+def _acquire_fetch_lock(steam_id: str) -> Optional[str]:
+    """
+    Take the fetch lock for a Steam ID.
+    
+    Returns:
+        Token identifying this holder, or None if the lock is already taken
+    """
+    token = uuid.uuid4().hex
+    if cache.add(f"inventory_lock_{steam_id}", token, FETCH_LOCK_TIMEOUT):
+        return token
+    return None
+
+
+def _release_fetch_lock(steam_id: str, token: str) -> None:
+    """
+    Release the fetch lock, unless it expired and another caller took it.
+    """
+    lock_key = f"inventory_lock_{steam_id}"
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def _refresh_inventory(steam_id: str, token: str) -> None:
+    """
+    Refresh a stale cached inventory in the background.
+    """
+    try:
+        _fetch_inventory(steam_id)
+    except Exception:
+        logger.exception("Background inventory refresh failed for %s", steam_id)
+    finally:
+        _release_fetch_lock(steam_id, token)
+
+
+def _fetch_inventory_once(steam_id: str) -> List[Dict]:
+    """
+    Fetch an inventory unless another request is already fetching it.
+    
+    Concurrent callers wait for the running fetch to finish and read its
+    result from the cache instead of calling Steam again.
+    """
+    token = _acquire_fetch_lock(steam_id)
+    if token is not None:
+        try:
+            return _fetch_inventory(steam_id)
+        finally:
+            _release_fetch_lock(steam_id, token)
+    
+    lock_key = f"inventory_lock_{steam_id}"
+    
+    logger.debug("Waiting for running inventory fetch for %s", steam_id)
+    deadline = time.monotonic() + FETCH_LOCK_WAIT
+    while cache.get(lock_key) is not None and time.monotonic() < deadline:
+        time.sleep(FETCH_LOCK_POLL_INTERVAL)
+    return cache.get(f"inventory_{steam_id}") or []
+
 
 def get_user_inventory(steam_id: str, force_refresh: bool = False) -> List[Dict]:
     """
     Fetch CS2 inventory from Steam Community API.
     
-    STRICT CACHING POLICY:
-    - If force_refresh is False: ALWAYS return cached data if exists.
+    STALE-WHILE-REVALIDATE CACHING POLICY:
+    - If force_refresh is False: ALWAYS return cached data if exists. Data
+      older than FRESH_TIMEOUT is still returned immediately and refreshed
+      in the background.
     - If force_refresh is True: Call Steam API, update cache.
     """
     # 1. Validation
@@ -29,85 +207,25 @@ def get_user_inventory(steam_id: str, force_refresh: bool = False) -> List[Dict]
     if not steam_id.isdigit():
         raise ValueError(f"Invalid Steam ID format: {steam_id}")
     
-    # 2. STRICT CACHE CHECK (F5 Protection)
+    # 2. CACHE CHECK (F5 Protection)
     cache_key = f"inventory_{steam_id}"
+    fresh_key = f"inventory_fresh_{steam_id}"
     
     if not force_refresh:
-        cached_data = cache.get(cache_key)
+        cached = cache.get_many([cache_key, fresh_key])
+        cached_data = cached.get(cache_key)
         if cached_data is not None:
-            print(f"[DEBUG] Returning cached inventory for {steam_id} (No API Call)")
+            # Stale: schedule at most one background refresh per user
+            if fresh_key not in cached and (token := _acquire_fetch_lock(steam_id)) is not None:
+                logger.debug("Returning stale inventory for %s, refreshing in background", steam_id)
+                _REFRESH_EXECUTOR.submit(_refresh_inventory, steam_id, token)
+            else:
+                logger.debug("Returning cached inventory for %s (No API Call)", steam_id)
             return cached_data
     
     # 3. Direct Steam API Call
     # Only reaches here if cache is empty OR force_refresh=True
-    url = f"https://steamcommunity.com/inventory/{steam_id}/730/2"
-    params = {'l': 'english', 'count': 5000}
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    
-    print(f"[Prod Debug] Fetching from Direct Steam API: {url}")
-    
-    # Retry logic for 429 (Rate Limit)
-    for attempt in range(2):
-        try:
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            
-            if response.status_code == 429:
-                print(f"[DEBUG] 429 Rate Limit hit.")
-                if attempt == 0:
-                    time.sleep(2)
-                    continue
-                else:
-                    # If we fail and have old cache, maybe return it? 
-                    # But force_refresh was requested...
-                    raise Exception("Steam is rate-limiting requests. Please wait a few minutes.")
-            
-            if response.status_code == 403:
-                raise Exception("Inventory is Private. Set to Public.")
-                
-            if response.status_code != 200:
-                raise Exception(f"Steam Error {response.status_code}")
-                
-            data = response.json()
-            if not data or 'assets' not in data:
-                 return [] # Empty inventory
-            
-            # 4. Parse (Old simplified logic)
-            descriptions_map = {}
-            for desc in data.get('descriptions', []):
-                descriptions_map[str(desc.get('classid'))] = desc
-            
-            inventory = []
-            for asset in data.get('assets', []):
-                classid = str(asset.get('classid'))
-                description = descriptions_map.get(classid)
-                
-                if description and description.get('tradable') == 1:
-                    market_name = description.get('market_hash_name', 'Unknown')
-                    icon_hash = description.get('icon_url', '')
-                    icon_url = f"https://community.cloudflare.steamstatic.com/economy/image/{icon_hash}" if icon_hash else ''
-                    
-                    inventory.append({
-                        'asset_id': asset.get('assetid'),
-                        'market_name': market_name,
-                        'market_hash_name': market_name,
-                        'icon_url': icon_url,
-                        'tradable': 1
-                    })
-            
-            # 5. Update Cache
-            print(f"[DEBUG] Caching {len(inventory)} items.")
-            cache.set(cache_key, inventory, CACHE_TIMEOUT)
-            return inventory
-            
-        except requests.exceptions.RequestException as e:
-            if attempt == 0:
-                time.sleep(2)
-                continue
-            raise Exception(f"Connection Error: {e}")
-
-    return []
+    return _fetch_inventory_once(steam_id)
 
 def get_item_details(asset_id: str, steam_id: str) -> Optional[Dict]:
     # Reuse main function, logic ensures we use cache if available
@@ -47,6 +47,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'social_django.middleware.SocialAuthExceptionMiddleware',
+    # Must stay last: short-circuits hot GET routes past URL resolution
+    'core.middleware.FastPathMiddleware',
 ]
 
 ROOT_URLCONF = 'skinmp.urls'
@@ -75,25 +77,67 @@ WSGI_APPLICATION = 'skinmp.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# SQLite by default; set DB_NAME to use PostgreSQL instead
+if os.getenv('DB_NAME'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME'),
+            'USER': os.getenv('DB_USER', ''),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Keep connections open between requests to skip TCP + auth setup
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'server_side_binding': True,
+            },
+        }
+    }
+    # PgBouncer in transaction pooling mode can't keep a server-side cursor
+    # or a prepared statement alive across transactions, so fall back to
+    # client-side cursors and stop psycopg from auto-preparing statements
+    if os.getenv('DB_PGBOUNCER', 'False').lower() in ('true', '1', 'yes'):
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+        DATABASES['default']['OPTIONS']['prepare_threshold'] = None
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
     }
-}
 
 # Cache Configuration
-# Using local memory cache to store Steam inventory and reduce API calls
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Used to store Steam inventory and reduce API calls. Local memory cache by
+# default; set REDIS_URL to share the cache between processes via Redis
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
     }
-}
 
 # Steam Inventory Cache Timeout (in seconds) - 10 minutes
+# Older inventories are still served but refreshed in the background
 STEAM_INVENTORY_CACHE_TIMEOUT = 600
 
+# How long a fetched inventory is kept at all (in seconds) - 24 hours
+STEAM_INVENTORY_STALE_TIMEOUT = 86400
+
+# Steam Community inventory endpoint for CS2 (app 730)
+STEAM_INVENTORY_URL_TMPL = 'https://steamcommunity.com/inventory/{steam_id}/730/2'
+STEAM_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators